@@ -8,7 +8,7 @@ import logging
 import time
 import uuid
 from datetime import datetime
-from typing import Optional, List, Callable
+from typing import Optional, List, Callable, Set
 
 from livekit import rtc
 from livekit.agents import (
@@ -92,6 +92,8 @@ class VoiceAgent:
         self.tool_call_logs: List[ToolCallLog] = []
         self.started_at: Optional[datetime] = None
         self.is_active = False
+        # Tool call log writes still in flight, awaited when the conversation ends
+        self._pending_log_writes: Set[asyncio.Task] = set()
 
     def create_agent_session(
         self,
@@ -169,8 +171,8 @@ class VoiceAgent:
         )
         self.tool_call_logs.append(log)
 
-        # Log to database
-        await self.db.log_tool_call(log)
+        # Log to database without delaying the response
+        self.db.run_in_background(self.db.log_tool_call(log), self._pending_log_writes)
 
         # Notify frontend
         if self.on_tool_call:
@@ -189,9 +191,9 @@ class VoiceAgent:
             # Get appointments affected
             state = self.tools.state
             appointments_affected = {
-                "booked": state.appointments_booked if state else [],
-                "modified": state.appointments_modified if state else [],
-                "cancelled": state.appointments_cancelled if state else [],
+                "booked": list(state.appointments_booked) if state else [],
+                "modified": list(state.appointments_modified) if state else [],
+                "cancelled": list(state.appointments_cancelled) if state else [],
             }
 
             # Generate summary via LLM
@@ -241,6 +243,10 @@ class VoiceAgent:
         """End the conversation and generate summary."""
         self.is_active = False
 
+        # Make sure deferred tool call logs are written
+        if self._pending_log_writes:
+            await asyncio.gather(*self._pending_log_writes, return_exceptions=True)
+
         # Log end event
         await self.db.log_event(EventLog(
             session_id=self.session_id,
@@ -5,6 +5,8 @@ from enum import Enum
 from typing import Optional
 from pydantic import BaseModel, Field
 
+from ..utils.helpers import format_date_for_speech, format_time_for_speech
+
 
 class AppointmentStatus(str, Enum):
     """Possible appointment statuses."""
@@ -46,6 +48,16 @@ class Appointment(BaseModel):
         """Get formatted datetime string."""
         return f"{self.date} at {self.time}"
 
+    @property
+    def friendly_date(self) -> str:
+        """Get date formatted for speech (e.g., "Monday, January 05")."""
+        return format_date_for_speech(self.date)
+
+    @property
+    def friendly_time(self) -> str:
+        """Get time formatted for speech (e.g., "8:30 AM")."""
+        return format_time_for_speech(self.time)
+
     def to_verbal_summary(self) -> str:
         """Generate a verbal summary for TTS."""
         status_text = ""
@@ -55,7 +67,7 @@ class Appointment(BaseModel):
             status_text = " (completed)"
 
         purpose_text = f" for {self.purpose}" if self.purpose else ""
-        return f"Appointment on {self.date} at {self.time}{purpose_text}{status_text}"
+        return f"Appointment on {self.friendly_date} at {self.friendly_time}{purpose_text}{status_text}"
 
     class Config:
         use_enum_values = True
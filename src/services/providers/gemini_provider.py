@@ -30,6 +30,12 @@ class GeminiProvider(BaseLLMProvider):
         self.model = model
         self.client = genai.Client(api_key=api_key)
 
+        # Converted history from the previous call, reused when the
+        # conversation has only grown since then
+        self._converted: list[dict[str, Any]] = []
+        self._converted_count = 0
+        self._converted_tail: Optional[dict[str, Any]] = None
+
     async def generate_response(
         self,
         messages: list[dict[str, Any]],
@@ -40,7 +46,7 @@ class GeminiProvider(BaseLLMProvider):
         """Generate a response using Gemini."""
         try:
             # Convert messages to Gemini format
-            system_instruction, gemini_messages = convert_messages_to_gemini(
+            system_instruction, gemini_messages = self._convert_messages(
                 messages, system_prompt
             )
 
@@ -83,6 +89,36 @@ class GeminiProvider(BaseLLMProvider):
             logger.error(f"Gemini API error: {e}")
             raise
 
+    def _convert_messages(
+        self,
+        messages: list[dict[str, Any]],
+        system_prompt: str,
+    ) -> tuple[str, list[dict[str, Any]]]:
+        """
+        Convert messages to Gemini format, reusing the previous conversion.
+
+        History is append-only within a conversation, so when the previously
+        converted messages are still a prefix only the new tail is converted.
+        """
+        count = self._converted_count
+        if (
+            count
+            and len(messages) >= count
+            and messages[count - 1] is self._converted_tail
+        ):
+            system_instruction, new_messages = convert_messages_to_gemini(
+                messages, system_prompt, start=count
+            )
+            self._converted.extend(new_messages)
+        else:
+            system_instruction, self._converted = convert_messages_to_gemini(
+                messages, system_prompt
+            )
+
+        self._converted_count = len(messages)
+        self._converted_tail = messages[-1] if messages else None
+        return system_instruction, list(self._converted)
+
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse Gemini response into standardized format."""
         content = None
@@ -29,6 +29,13 @@ class GroqProvider(BaseLLMProvider):
         self.model = model
         self.client = AsyncGroq(api_key=api_key)
 
+        # Converted history from the previous call, reused when the
+        # conversation has only grown since then
+        self._converted: list[dict[str, Any]] = []
+        self._converted_count = 0
+        self._converted_tail: Optional[dict[str, Any]] = None
+        self._converted_system_prompt: Optional[str] = None
+
     async def generate_response(
         self,
         messages: list[dict[str, Any]],
@@ -39,7 +46,7 @@ class GroqProvider(BaseLLMProvider):
         """Generate a response using Groq."""
         try:
             # Convert messages to Groq/OpenAI format
-            groq_messages = convert_messages_to_groq(messages, system_prompt)
+            groq_messages = self._convert_messages(messages, system_prompt)
 
             # Build request parameters
             params = {
@@ -65,6 +72,35 @@ class GroqProvider(BaseLLMProvider):
             logger.error(f"Groq API error: {e}")
             raise
 
+    def _convert_messages(
+        self,
+        messages: list[dict[str, Any]],
+        system_prompt: str,
+    ) -> list[dict[str, Any]]:
+        """
+        Convert messages to Groq format, reusing the previous conversion.
+
+        History is append-only within a conversation, so when the previously
+        converted messages are still a prefix only the new tail is converted.
+        """
+        count = self._converted_count
+        if (
+            count
+            and len(messages) >= count
+            and messages[count - 1] is self._converted_tail
+            and system_prompt == self._converted_system_prompt
+        ):
+            self._converted.extend(
+                convert_messages_to_groq(messages, system_prompt, start=count)
+            )
+        else:
+            self._converted = convert_messages_to_groq(messages, system_prompt)
+
+        self._converted_count = len(messages)
+        self._converted_tail = messages[-1] if messages else None
+        self._converted_system_prompt = system_prompt
+        return list(self._converted)
+
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse Groq response into standardized format."""
         content = None
@@ -2,14 +2,35 @@
 
 import logging
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Collection, List, Optional
 from zoneinfo import ZoneInfo
 
 from ..models import TimeSlot
+from ..utils.helpers import format_date_for_speech, format_time_for_speech
 
 logger = logging.getLogger(__name__)
 
 
+def slot_key(date: str, time: str) -> int:
+    """
+    Pack a slot's date and time into a single int, YYYYMMDDHHMM.
+
+    Args:
+        date: Date in YYYY-MM-DD format
+        time: Time in HH:MM format (any trailing seconds are ignored)
+
+    Returns:
+        Integer key used for booked-slot lookups
+    """
+    return (
+        int(date[:4]) * 100000000
+        + int(date[5:7]) * 1000000
+        + int(date[8:10]) * 10000
+        + int(time[:2]) * 100
+        + int(time[3:5])
+    )
+
+
 class SlotGenerator:
     """Generates available appointment slots based on configuration."""
 
@@ -41,7 +62,7 @@ class SlotGenerator:
         self,
         user_timezone: str = "UTC",
         duration_minutes: Optional[int] = None,
-        booked_slots: Optional[List[tuple]] = None,
+        booked_slots: Optional[Collection[int]] = None,
     ) -> List[TimeSlot]:
         """
         Generate all available slots for the booking period.
@@ -49,13 +70,16 @@ class SlotGenerator:
         Args:
             user_timezone: User's timezone string (e.g., "America/New_York")
             duration_minutes: Requested slot duration
-            booked_slots: List of (date, time) tuples that are already booked
+            booked_slots: Set of slot_key() values that are already booked
 
         Returns:
             List of available TimeSlot objects
         """
         duration = duration_minutes or self.default_slot_duration
-        booked_set = set(booked_slots or [])
+        if isinstance(booked_slots, (set, frozenset)):
+            booked_set = booked_slots
+        else:
+            booked_set = set(booked_slots or [])
 
         try:
             tz = ZoneInfo(user_timezone)
@@ -66,54 +90,71 @@ class SlotGenerator:
         now = datetime.now(tz)
         slots = []
 
+        # Slots today must start more than 1 hour from now (1 hour buffer).
+        # Comparing minutes-since-midnight avoids building a datetime per slot.
+        cutoff_minutes = now.hour * 60 + now.minute + 60
+
+        # The times of day are the same for every business day, so
+        # enumerate them once instead of per day
+        day_times = self._day_times(duration)
+        business_days = frozenset(self.business_days)
+
         for day_offset in range(self.booking_advance_days):
             current_date = now.date() + timedelta(days=day_offset)
 
             # Skip non-business days
-            if current_date.weekday() not in self.business_days:
+            if current_date.weekday() not in business_days:
                 continue
 
-            # Generate time slots for this day
-            for hour in range(self.business_hours_start, self.business_hours_end):
-                for minute in [0, 30]:  # 30-minute intervals
-                    # Skip if this slot wouldn't fit within business hours
-                    slot_end_hour = hour + (minute + duration) // 60
-                    slot_end_minute = (minute + duration) % 60
-                    if slot_end_hour > self.business_hours_end or (
-                        slot_end_hour == self.business_hours_end and slot_end_minute > 0
-                    ):
-                        continue
-
-                    date_str = current_date.strftime("%Y-%m-%d")
-                    time_str = f"{hour:02d}:{minute:02d}"
-
-                    # Skip if in the past (for today)
-                    if day_offset == 0:
-                        slot_datetime = datetime.combine(
-                            current_date,
-                            datetime.strptime(time_str, "%H:%M").time(),
-                            tzinfo=tz
-                        )
-                        if slot_datetime <= now + timedelta(hours=1):  # 1 hour buffer
-                            continue
-
-                    # Check if slot is booked
-                    is_available = (date_str, time_str) not in booked_set
-
-                    slots.append(TimeSlot(
-                        date=date_str,
-                        time=time_str,
-                        duration_minutes=duration,
-                        is_available=is_available,
-                    ))
+            date_str = current_date.strftime("%Y-%m-%d")
+            date_key = (
+                current_date.year * 10000 + current_date.month * 100 + current_date.day
+            ) * 10000
+
+            for start_minute, time_str, time_key in day_times:
+                # Skip if in the past (for today)
+                if day_offset == 0 and start_minute <= cutoff_minutes:
+                    continue
+
+                # Check if slot is booked
+                is_available = date_key + time_key not in booked_set
+
+                # Values are generated here, so skip pydantic validation
+                slots.append(TimeSlot.model_construct(
+                    date=date_str,
+                    time=time_str,
+                    duration_minutes=duration,
+                    is_available=is_available,
+                ))
 
         return slots
 
+    def _day_times(self, duration: int) -> List[tuple[int, str, int]]:
+        """
+        Enumerate slot start times that fit within business hours.
+
+        Args:
+            duration: Slot duration in minutes
+
+        Returns:
+            List of (minutes since midnight, "HH:MM", HHMM) tuples
+        """
+        day_end = self.business_hours_end * 60
+        times = []
+        for hour in range(self.business_hours_start, self.business_hours_end):
+            for minute in (0, 30):  # 30-minute intervals
+                start_minute = hour * 60 + minute
+                # Skip if this slot wouldn't fit within business hours
+                if start_minute + duration > day_end:
+                    continue
+                times.append((start_minute, f"{hour:02d}:{minute:02d}", hour * 100 + minute))
+        return times
+
     def get_available_slots(
         self,
         user_timezone: str = "UTC",
         duration_minutes: Optional[int] = None,
-        booked_slots: Optional[List[tuple]] = None,
+        booked_slots: Optional[Collection[int]] = None,
         limit: Optional[int] = None,
     ) -> List[TimeSlot]:
         """
@@ -122,7 +163,7 @@ class SlotGenerator:
         Args:
             user_timezone: User's timezone
             duration_minutes: Requested slot duration
-            booked_slots: Already booked (date, time) tuples
+            booked_slots: Already booked slot_key() values
             limit: Maximum number of slots to return
 
         Returns:
@@ -139,7 +180,7 @@ class SlotGenerator:
         self,
         date: str,
         user_timezone: str = "UTC",
-        booked_slots: Optional[List[tuple]] = None,
+        booked_slots: Optional[Collection[int]] = None,
     ) -> List[TimeSlot]:
         """Get available slots for a specific date."""
         all_slots = self.get_available_slots(user_timezone, booked_slots=booked_slots)
@@ -175,33 +216,19 @@ class SlotGenerator:
 
         parts = []
         for date_str, times in by_date.items():
-            try:
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                friendly_date = date_obj.strftime("%A, %B %d")
-            except ValueError:
-                friendly_date = date_str
-
-            # Format times
-            formatted_times = []
-            for t in times:
-                try:
-                    time_obj = datetime.strptime(t, "%H:%M")
-                    formatted_times.append(time_obj.strftime("%I:%M %p").lstrip("0"))
-                except ValueError:
-                    formatted_times.append(t)
-
-            if len(formatted_times) == 1:
-                parts.append(f"{friendly_date} at {formatted_times[0]}")
-            else:
-                times_str = ", ".join(formatted_times[:-1]) + f" or {formatted_times[-1]}"
-                parts.append(f"{friendly_date} at {times_str}")
-
-        result = "; ".join(parts)
+            friendly_date = format_date_for_speech(date_str)
+            formatted_times = [format_time_for_speech(t) for t in times]
+
+            if len(formatted_times) > 1:
+                # "8:00 AM, 8:30 AM or 9:00 AM"
+                formatted_times[-2:] = [f"{formatted_times[-2]} or {formatted_times[-1]}"]
+            parts.append(f"{friendly_date} at {', '.join(formatted_times)}")
 
+        more = ""
         if total > max_slots:
-            result += f". I have {total - max_slots} more slots available if these don't work for you."
+            more = f". I have {total - max_slots} more slots available if these don't work for you."
 
-        return result
+        return "; ".join(parts) + more
 
     def validate_slot(
         self,
@@ -1,13 +1,15 @@
 """Supabase service for database operations."""
 
+import asyncio
 import logging
 from datetime import datetime
-from typing import Optional, List
+from typing import FrozenSet, Optional, List, Set
 from supabase import create_client, Client
 
 from ..models import Appointment, AppointmentStatus, ConversationSummary, ToolCallLog
 from ..models.user import User
 from ..models.conversation import EventLog
+from .slot_generator import slot_key
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +20,8 @@ class SupabaseService:
     def __init__(self, url: str, key: str):
         """Initialize Supabase client."""
         self.client: Client = create_client(url, key)
+        # Strong references to fire-and-forget tasks so they aren't GC'd
+        self._background_tasks: set[asyncio.Task] = set()
         logger.info("Supabase client initialized")
 
     # ==================== User Operations ====================
@@ -25,7 +29,7 @@ class SupabaseService:
     async def get_user_by_phone(self, phone: str) -> Optional[User]:
         """Get user by phone number."""
         try:
-            response = self.client.table("users").select("*").eq("phone_number", phone).single().execute()
+            response = await self._execute(self.client.table("users").select("*").eq("phone_number", phone).single())
             if response.data:
                 return User(**response.data)
             return None
@@ -43,7 +47,7 @@ class SupabaseService:
                 update_data = {"last_interaction": now}
                 if name:
                     update_data["name"] = name
-                self.client.table("users").update(update_data).eq("phone_number", phone).execute()
+                await self._execute(self.client.table("users").update(update_data).eq("phone_number", phone))
                 existing.last_interaction = datetime.fromisoformat(now)
                 if name:
                     existing.name = name
@@ -57,7 +61,7 @@ class SupabaseService:
                     "preferences": {},
                     "total_appointments": 0,
                 }
-                response = self.client.table("users").insert(user_data).execute()
+                response = await self._execute(self.client.table("users").insert(user_data))
                 return User(**response.data[0])
         except Exception as e:
             logger.error(f"Error creating/updating user: {e}")
@@ -82,7 +86,7 @@ class SupabaseService:
                 today = datetime.utcnow().strftime("%Y-%m-%d")
                 query = query.gte("date", today)
 
-            response = query.order("date", desc=False).order("time", desc=False).execute()
+            response = await self._execute(query.order("date", desc=False).order("time", desc=False))
             return [Appointment(**apt) for apt in response.data]
         except Exception as e:
             logger.error(f"Error fetching appointments: {e}")
@@ -91,7 +95,7 @@ class SupabaseService:
     async def get_appointment_by_id(self, appointment_id: str) -> Optional[Appointment]:
         """Get a specific appointment by ID."""
         try:
-            response = self.client.table("appointments").select("*").eq("id", appointment_id).single().execute()
+            response = await self._execute(self.client.table("appointments").select("*").eq("id", appointment_id).single())
             if response.data:
                 return Appointment(**response.data)
             return None
@@ -99,54 +103,101 @@ class SupabaseService:
             logger.error(f"Error fetching appointment: {e}")
             return None
 
+    async def get_appointment_by_phone_date_time(
+        self,
+        phone: str,
+        date: str,
+        time: str,
+    ) -> Optional[Appointment]:
+        """Get a user's scheduled appointment at a specific date and time."""
+        try:
+            response = await self._execute(
+                self.client.table("appointments")
+                .select("*")
+                .eq("user_phone", phone)
+                .eq("date", date)
+                .eq("time", time)
+                .eq("status", AppointmentStatus.SCHEDULED.value)
+                .limit(1)
+            )
+            if response.data:
+                return Appointment(**response.data[0])
+            return None
+        except Exception as e:
+            logger.error(f"Error fetching appointment: {e}")
+            return None
+
     async def check_slot_available(self, date: str, time: str) -> bool:
         """Check if a slot is available (not already booked)."""
         try:
-            response = (
+            response = await self._execute(
                 self.client.table("appointments")
                 .select("id")
                 .eq("date", date)
                 .eq("time", time)
                 .eq("status", AppointmentStatus.SCHEDULED.value)
-                .execute()
             )
             return len(response.data) == 0
         except Exception as e:
             logger.error(f"Error checking slot availability: {e}")
             return False
 
-    async def create_appointment(self, appointment: Appointment) -> Appointment:
-        """Create a new appointment."""
+    async def get_booked_slots(self) -> Optional[FrozenSet[int]]:
+        """Get slot_key() values for all scheduled appointments, or None on error."""
         try:
-            # Check for double booking
-            is_available = await self.check_slot_available(appointment.date, appointment.time)
-            if not is_available:
-                raise ValueError(f"Slot {appointment.date} at {appointment.time} is already booked")
+            response = await self._execute(
+                self.client.table("appointments")
+                .select("date, time")
+                .eq("status", AppointmentStatus.SCHEDULED.value)
+            )
+            return frozenset(slot_key(apt["date"], apt["time"]) for apt in response.data)
+        except Exception as e:
+            logger.warning(f"Error getting booked slots: {e}")
+            return None
 
-            now = datetime.utcnow().isoformat()
-            apt_data = {
-                "user_phone": appointment.user_phone,
-                "user_name": appointment.user_name,
-                "date": appointment.date,
-                "time": appointment.time,
-                "duration_minutes": appointment.duration_minutes,
-                "purpose": appointment.purpose,
-                "status": appointment.status,
-                "created_at": now,
-                "updated_at": now,
-                "notes": appointment.notes,
-            }
+    async def create_appointment(self, appointment: Appointment) -> Appointment:
+        """Create a new appointment, raising ValueError if the slot is taken."""
+        created = await self.book_appointment(appointment)
+        if not created:
+            raise ValueError(f"Slot {appointment.date} at {appointment.time} is already booked")
+        return created
 
-            response = self.client.table("appointments").insert(apt_data).execute()
-            created = Appointment(**response.data[0])
+    async def book_appointment(
+        self,
+        appointment: Appointment,
+        user_name: Optional[str] = None,
+    ) -> Optional[Appointment]:
+        """
+        Book an appointment in a single transaction.
+
+        Calls the book_appointment_tx database function, which checks the slot
+        is free, upserts the user (setting user_name if given) and inserts the
+        appointment atomically.
 
-            # Update user's appointment count
-            await self._increment_user_appointments(appointment.user_phone)
+        Returns:
+            The created appointment, or None if the slot is already booked
+        """
+        try:
+            response = await self._execute(
+                self.client.rpc("book_appointment_tx", {
+                    "p_phone": appointment.user_phone,
+                    "p_name": user_name,
+                    "p_user_name": appointment.user_name,
+                    "p_date": appointment.date,
+                    "p_time": appointment.time,
+                    "p_duration": appointment.duration_minutes,
+                    "p_purpose": appointment.purpose,
+                    "p_notes": appointment.notes,
+                })
+            )
+            if not response.data:
+                return None
 
+            created = Appointment(**response.data[0])
             logger.info(f"Created appointment {created.id} for {appointment.user_phone}")
             return created
         except Exception as e:
-            logger.error(f"Error creating appointment: {e}")
+            logger.error(f"Error booking appointment: {e}")
             raise
 
     async def update_appointment(
@@ -157,11 +208,10 @@ class SupabaseService:
         """Update an appointment."""
         try:
             updates["updated_at"] = datetime.utcnow().isoformat()
-            response = (
+            response = await self._execute(
                 self.client.table("appointments")
                 .update(updates)
                 .eq("id", appointment_id)
-                .execute()
             )
             if response.data:
                 return Appointment(**response.data[0])
@@ -185,8 +235,17 @@ class SupabaseService:
     ) -> Optional[Appointment]:
         """Modify appointment date/time."""
         try:
-            # Get current appointment
-            current = await self.get_appointment_by_id(appointment_id)
+            if new_date and new_time:
+                # Target slot is fully known, so look up the current
+                # appointment and check availability concurrently
+                current, is_available = await asyncio.gather(
+                    self.get_appointment_by_id(appointment_id),
+                    self.check_slot_available(new_date, new_time),
+                )
+            else:
+                current = await self.get_appointment_by_id(appointment_id)
+                is_available = None
+
             if not current:
                 raise ValueError(f"Appointment {appointment_id} not found")
 
@@ -195,7 +254,8 @@ class SupabaseService:
 
             # Check if new slot is available
             if new_date or new_time:
-                is_available = await self.check_slot_available(target_date, target_time)
+                if is_available is None:
+                    is_available = await self.check_slot_available(target_date, target_time)
                 if not is_available:
                     raise ValueError(f"Slot {target_date} at {target_time} is not available")
 
@@ -210,16 +270,37 @@ class SupabaseService:
             logger.error(f"Error modifying appointment: {e}")
             raise
 
-    async def _increment_user_appointments(self, phone: str) -> None:
-        """Increment user's total appointment count."""
-        try:
-            user = await self.get_user_by_phone(phone)
-            if user:
-                self.client.table("users").update(
-                    {"total_appointments": user.total_appointments + 1}
-                ).eq("phone_number", phone).execute()
-        except Exception as e:
-            logger.warning(f"Error incrementing appointment count: {e}")
+    async def _execute(self, query):
+        """
+        Execute a query builder without blocking the event loop.
+
+        supabase-py's execute() is synchronous, so it runs in a worker thread.
+        """
+        return await asyncio.to_thread(query.execute)
+
+    def run_in_background(
+        self,
+        coro,
+        pending: Optional[Set[asyncio.Task]] = None,
+    ) -> asyncio.Task:
+        """
+        Schedule a coroutine without awaiting it, keeping a reference until done.
+
+        Args:
+            coro: Coroutine to run, e.g. a logging write
+            pending: Optional caller-owned set that also tracks the task while
+                it runs, so the caller can wait for its own work to finish
+
+        Returns:
+            The scheduled task
+        """
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        if pending is not None:
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        return task
 
     # ==================== Logging Operations ====================
 
@@ -236,7 +317,7 @@ class SupabaseService:
                 "duration_ms": log.duration_ms,
                 "timestamp": log.timestamp.isoformat(),
             }
-            self.client.table("tool_call_logs").insert(log_data).execute()
+            await self._execute(self.client.table("tool_call_logs").insert(log_data))
         except Exception as e:
             logger.warning(f"Error logging tool call: {e}")
 
@@ -250,7 +331,7 @@ class SupabaseService:
                 "severity": event.severity,
                 "timestamp": event.timestamp.isoformat(),
             }
-            self.client.table("event_logs").insert(event_data).execute()
+            await self._execute(self.client.table("event_logs").insert(event_data))
         except Exception as e:
             logger.warning(f"Error logging event: {e}")
 
@@ -273,20 +354,19 @@ class SupabaseService:
                 "started_at": summary.started_at.isoformat(),
                 "ended_at": summary.ended_at.isoformat(),
             }
-            self.client.table("conversation_summaries").insert(summary_data).execute()
+            await self._execute(self.client.table("conversation_summaries").insert(summary_data))
         except Exception as e:
             logger.error(f"Error saving conversation summary: {e}")
 
     async def get_conversation_history(self, phone: str, limit: int = 10) -> List[ConversationSummary]:
         """Get past conversation summaries for a user."""
         try:
-            response = (
+            response = await self._execute(
                 self.client.table("conversation_summaries")
                 .select("*")
                 .eq("user_phone", phone)
                 .order("ended_at", desc=True)
                 .limit(limit)
-                .execute()
             )
             return [ConversationSummary(**s) for s in response.data]
         except Exception as e:
@@ -302,13 +382,12 @@ class SupabaseService:
     ) -> List[Appointment]:
         """Get all appointments (for admin panel)."""
         try:
-            response = (
+            response = await self._execute(
                 self.client.table("appointments")
                 .select("*")
                 .order("date", desc=True)
                 .order("time", desc=True)
                 .range(offset, offset + limit - 1)
-                .execute()
             )
             return [Appointment(**apt) for apt in response.data]
         except Exception as e:
@@ -318,7 +397,7 @@ class SupabaseService:
     async def get_appointments_count(self) -> int:
         """Get total appointment count."""
         try:
-            response = self.client.table("appointments").select("id", count="exact").execute()
+            response = await self._execute(self.client.table("appointments").select("id", count="exact"))
             return response.count or 0
         except Exception as e:
             logger.error(f"Error getting appointment count: {e}")
@@ -1,6 +1,7 @@
 """Tool schema converters for different LLM providers."""
 
-from typing import Any
+import json
+from typing import Any, Optional
 
 
 def anthropic_to_gemini(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -84,6 +85,7 @@ def anthropic_to_groq(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
 def convert_messages_to_gemini(
     messages: list[dict[str, Any]],
     system_prompt: str,
+    start: int = 0,
 ) -> tuple[str, list[dict[str, Any]]]:
     """
     Convert standard messages to Gemini format.
@@ -101,66 +103,77 @@ def convert_messages_to_gemini(
         {"role": "model", "parts": [{"text": "..."}]},
     ]
 
+    Args:
+        messages: Conversation history
+        system_prompt: System prompt (returned as the system instruction)
+        start: Index of the first message to convert, for callers that
+            cached the conversion of messages[:start]
+
     Returns:
         Tuple of (system_instruction, converted_messages)
     """
-    gemini_messages = []
-
-    for msg in messages:
-        role = msg.get("role", "user")
-        content = msg.get("content", "")
-
-        # Map roles
-        gemini_role = "model" if role == "assistant" else "user"
-
-        # Handle content
-        if isinstance(content, str):
-            parts = [{"text": content}]
-        elif isinstance(content, list):
-            parts = []
-            for item in content:
-                if isinstance(item, dict):
-                    if item.get("type") == "text":
-                        parts.append({"text": item.get("text", "")})
-                    elif item.get("type") == "tool_use":
-                        # Function call from assistant
-                        parts.append({
-                            "functionCall": {
-                                "name": item.get("name", ""),
-                                "args": item.get("input", {}),
-                            }
-                        })
-                    elif item.get("type") == "tool_result":
-                        # Tool result from user
-                        result_content = item.get("content", "")
-                        if isinstance(result_content, str):
-                            result_text = result_content
-                        else:
-                            result_text = str(result_content)
-                        parts.append({
-                            "functionResponse": {
-                                "name": item.get("tool_use_id", "unknown"),
-                                "response": {"result": result_text},
-                            }
-                        })
-                else:
-                    parts.append({"text": str(item)})
-            if not parts:
-                parts = [{"text": ""}]
-        else:
-            parts = [{"text": str(content)}]
-
-        gemini_messages.append({
-            "role": gemini_role,
-            "parts": parts,
-        })
-
+    gemini_messages = [_to_gemini_message(msg) for msg in messages[start:]]
     return system_prompt, gemini_messages
 
 
+def _to_gemini_message(msg: dict[str, Any]) -> dict[str, Any]:
+    """Convert a single standard message to Gemini format."""
+    content = msg.get("content", "")
+
+    # Map roles
+    gemini_role = "model" if msg.get("role", "user") == "assistant" else "user"
+
+    # Handle content
+    if isinstance(content, str):
+        parts = [_text_part(content)]
+    elif isinstance(content, list):
+        parts = [_to_gemini_part(item) for item in content]
+        parts = [part for part in parts if part is not None] or [_text_part("")]
+    else:
+        parts = [_text_part(str(content))]
+
+    return {"role": gemini_role, "parts": parts}
+
+
+def _to_gemini_part(item: Any) -> Optional[dict[str, Any]]:
+    """Convert a content block to a Gemini part, or None if unsupported."""
+    if not isinstance(item, dict):
+        return _text_part(str(item))
+
+    item_type = item.get("type")
+    if item_type == "text":
+        return _text_part(item.get("text", ""))
+    if item_type == "tool_use":
+        # Function call from assistant
+        return {
+            "functionCall": {
+                "name": item.get("name", ""),
+                "args": item.get("input", {}),
+            }
+        }
+    if item_type == "tool_result":
+        # Tool result from user
+        result_content = item.get("content", "")
+        if not isinstance(result_content, str):
+            result_content = str(result_content)
+        return {
+            "functionResponse": {
+                "name": item.get("tool_use_id", "unknown"),
+                "response": {"result": result_content},
+            }
+        }
+    return None
+
+
+def _text_part(text: str) -> dict[str, Any]:
+    """Build a Gemini text part."""
+    return {"text": text}
+
+
 def convert_messages_to_groq(
     messages: list[dict[str, Any]],
     system_prompt: str,
+    start: int = 0,
 ) -> list[dict[str, Any]]:
     """
     Convert standard messages to Groq/OpenAI format.
@@ -179,78 +192,114 @@ def convert_messages_to_groq(
         {"role": "assistant", "content": "...", "tool_calls": [...]},
         {"role": "tool", "tool_call_id": "...", "content": "..."},
     ]
+
+    Args:
+        messages: Conversation history
+        system_prompt: System prompt, emitted first when start is 0
+        start: Index of the first message to convert. Callers that cached
+            the conversion of messages[:start] can pass it to convert only
+            the new tail (the system message is then omitted).
     """
     groq_messages = []
 
     # Add system message first
-    if system_prompt:
+    if system_prompt and start == 0:
         groq_messages.append({
             "role": "system",
             "content": system_prompt,
         })
 
-    for msg in messages:
-        role = msg.get("role", "user")
-        content = msg.get("content", "")
-
-        if isinstance(content, str):
-            groq_messages.append({
-                "role": role,
-                "content": content,
-            })
-        elif isinstance(content, list):
-            # Complex content with potential tool calls/results
-            text_parts = []
-            tool_calls = []
-            tool_results = []
-
-            for item in content:
-                if isinstance(item, dict):
-                    item_type = item.get("type", "")
-                    if item_type == "text":
-                        text_parts.append(item.get("text", ""))
-                    elif item_type == "tool_use":
-                        # Assistant made a tool call
-                        import json
-                        tool_calls.append({
-                            "id": item.get("id", ""),
-                            "type": "function",
-                            "function": {
-                                "name": item.get("name", ""),
-                                "arguments": json.dumps(item.get("input", {})),
-                            },
-                        })
-                    elif item_type == "tool_result":
-                        # Tool result
-                        result_content = item.get("content", "")
-                        if not isinstance(result_content, str):
-                            result_content = str(result_content)
-                        tool_results.append({
-                            "role": "tool",
-                            "tool_call_id": item.get("tool_use_id", ""),
-                            "content": result_content,
-                        })
-
-            # Add assistant message with tool calls
+    for msg in messages[start:]:
+        _append_groq_message(groq_messages, msg)
+
+    return groq_messages
+
+
+def _append_groq_message(groq_messages: list[dict[str, Any]], msg: dict[str, Any]) -> None:
+    """Convert a single standard message and append the result(s)."""
+    role = msg.get("role", "user")
+    content = msg.get("content", "")
+
+    if isinstance(content, str):
+        groq_messages.append({
+            "role": role,
+            "content": content,
+        })
+        return
+
+    if not isinstance(content, list):
+        return
+
+    # Common case: a single plain text block
+    if len(content) == 1:
+        item = content[0]
+        if isinstance(item, dict) and item.get("type") == "text":
             if role == "assistant":
-                assistant_msg = {"role": "assistant"}
-                if text_parts:
-                    assistant_msg["content"] = " ".join(text_parts)
-                else:
-                    assistant_msg["content"] = None
-                if tool_calls:
-                    assistant_msg["tool_calls"] = tool_calls
-                groq_messages.append(assistant_msg)
-
-            # Add tool results
-            for result in tool_results:
-                groq_messages.append(result)
-
-            # If user message with only text
-            if role == "user" and text_parts and not tool_results:
-                groq_messages.append({
-                    "role": "user",
-                    "content": " ".join(text_parts),
+                groq_messages.append({"role": "assistant", "content": item.get("text", "")})
+            elif role == "user":
+                groq_messages.append({"role": "user", "content": item.get("text", "")})
+            return
+
+    # Complex content with potential tool calls/results.
+    # Lists are only created once something is appended to them.
+    text_parts = None
+    tool_calls = None
+    tool_results = None
+
+    for item in content:
+        if isinstance(item, dict):
+            item_type = item.get("type", "")
+            if item_type == "text":
+                if text_parts is None:
+                    text_parts = []
+                text_parts.append(item.get("text", ""))
+            elif item_type == "tool_use":
+                # Assistant made a tool call
+                if tool_calls is None:
+                    tool_calls = []
+                tool_calls.append({
+                    "id": item.get("id", ""),
+                    "type": "function",
+                    "function": {
+                        "name": item.get("name", ""),
+                        "arguments": json.dumps(item.get("input", {})),
+                    },
+                })
+            elif item_type == "tool_result":
+                # Tool result
+                result_content = item.get("content", "")
+                if not isinstance(result_content, str):
+                    result_content = str(result_content)
+                if tool_results is None:
+                    tool_results = []
+                tool_results.append({
+                    "role": "tool",
+                    "tool_call_id": item.get("tool_use_id", ""),
+                    "content": result_content,
                 })
 
-    return groq_messages
+    # Add assistant message with tool calls
+    if role == "assistant":
+        assistant_msg = {"role": "assistant"}
+        assistant_msg["content"] = _join_text(text_parts) if text_parts else None
+        if tool_calls:
+            assistant_msg["tool_calls"] = tool_calls
+        groq_messages.append(assistant_msg)
+
+    # Add tool results
+    if tool_results:
+        groq_messages.extend(tool_results)
+
+    # If user message with only text
+    if role == "user" and text_parts and not tool_results:
+        groq_messages.append({
+            "role": "user",
+            "content": _join_text(text_parts),
+        })
+
+
+def _join_text(text_parts: list[str]) -> str:
+    """Join text blocks with spaces, skipping the join for a single block."""
+    if len(text_parts) == 1:
+        return text_parts[0]
+    return " ".join(text_parts)
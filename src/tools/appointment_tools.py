@@ -1,20 +1,42 @@
 """Appointment management tools for the voice agent."""
 
+import inspect
 import logging
-import re
-from datetime import datetime
-from typing import Optional, List, Any
+from collections import deque
+from time import monotonic
+from typing import Optional, Any, Deque, FrozenSet, Tuple
 from dataclasses import dataclass, field
 
 from ..models import Appointment, AppointmentStatus, TimeSlot
 from ..models.user import User, ConversationContext
 from ..services.supabase_service import SupabaseService
-from ..services.slot_generator import SlotGenerator
+from ..services.slot_generator import SlotGenerator, slot_key
+from ..utils.helpers import sanitize_phone
 
 logger = logging.getLogger(__name__)
 
+# How long booked slots fetched from the database are reused, in seconds
+BOOKED_SLOTS_TTL = 5.0
 
-@dataclass
+# Most recent bookings/modifications/cancellations kept per conversation
+MAX_TRACKED_APPOINTMENTS = 16
+
+# Verbal responses used on hot paths
+_TECHNICAL_ISSUE = "I'm sorry, there was a technical issue."
+_SLOTS_TMPL = "I have some availability for you. %s. Which time works best?"
+_BOOK_CONFIRM_TMPL = "I've booked your appointment for %s at %s%s. Is there anything else I can help you with?"
+_CANCEL_CONFIRM_TMPL = "I've cancelled your appointment on %s at %s. Is there anything else I can help you with?"
+_MODIFY_CONFIRM_TMPL = "I've updated your appointment to %s at %s. Is there anything else?"
+
+# Farewells keyed by ConversationState.last_action kind, filled from its details
+_FAREWELL_TMPLS = {
+    "booked": "Great! Your appointment is confirmed for %(date)s at %(time)s. Have a wonderful day!",
+    "modified": "Your appointment has been updated to %(new_date)s at %(new_time)s. Take care!",
+    "cancelled": "Your appointment has been cancelled. Feel free to reach out when you'd like to schedule again. Goodbye!",
+}
+
+
+@dataclass(slots=True)
 class ToolResult:
     """Result from a tool execution."""
     success: bool
@@ -24,7 +46,7 @@ class ToolResult:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationState:
     """Tracks the current conversation state."""
     session_id: str
@@ -32,12 +54,13 @@ class ConversationState:
     user_name: Optional[str] = None
     user: Optional[User] = None
     is_identified: bool = False
-    appointments_booked: List[dict] = field(default_factory=list)
-    appointments_modified: List[dict] = field(default_factory=list)
-    appointments_cancelled: List[dict] = field(default_factory=list)
+    appointments_booked: Deque[dict] = field(default_factory=lambda: deque(maxlen=MAX_TRACKED_APPOINTMENTS))
+    appointments_modified: Deque[dict] = field(default_factory=lambda: deque(maxlen=MAX_TRACKED_APPOINTMENTS))
+    appointments_cancelled: Deque[dict] = field(default_factory=lambda: deque(maxlen=MAX_TRACKED_APPOINTMENTS))
     mentioned_preferences: dict = field(default_factory=dict)
     user_timezone: str = "UTC"
     should_end: bool = False
+    last_action: Optional[Tuple[str, dict]] = None
 
 
 class AppointmentTools:
@@ -52,6 +75,17 @@ class AppointmentTools:
     - error: Error message if failed
     """
 
+    # Methods that can be invoked by name through execute_tool
+    _TOOL_NAMES: FrozenSet[str] = frozenset({
+        "identify_user",
+        "fetch_slots",
+        "book_appointment",
+        "retrieve_appointments",
+        "cancel_appointment",
+        "modify_appointment",
+        "end_conversation",
+    })
+
     def __init__(
         self,
         supabase_service: SupabaseService,
@@ -67,6 +101,13 @@ class AppointmentTools:
         self.db = supabase_service
         self.slots = slot_generator
         self.state: Optional[ConversationState] = None
+        # (fetched_at, booked slot keys), see _get_booked_slots
+        self._booked_slots_cache: Optional[Tuple[float, FrozenSet[int]]] = None
+        # Accepted parameter names per tool, checked before dispatch
+        self._tool_params = {
+            name: frozenset(inspect.signature(getattr(self, name)).parameters)
+            for name in self._TOOL_NAMES
+        }
 
     def init_conversation(self, session_id: str, timezone: str = "UTC") -> None:
         """Initialize a new conversation state."""
@@ -78,18 +119,7 @@ class AppointmentTools:
 
     def _normalize_phone(self, phone: str) -> str:
         """Normalize phone number to consistent format."""
-        # Remove all non-digit characters
-        digits = re.sub(r'\D', '', phone)
-
-        # Handle US numbers
-        if len(digits) == 10:
-            return f"+1{digits}"
-        elif len(digits) == 11 and digits.startswith('1'):
-            return f"+{digits}"
-        elif len(digits) > 10:
-            return f"+{digits}"
-
-        return digits
+        return sanitize_phone(phone)
 
     async def identify_user(self, phone_number: str) -> ToolResult:
         """
@@ -132,7 +162,7 @@ class AppointmentTools:
 
                 return ToolResult(
                     success=True,
-                    data={"user": user.model_dump(), "is_returning": True},
+                    data={"user": user.model_dump(exclude_unset=True), "is_returning": True},
                     message=f"User identified: {normalized_phone}",
                     verbal_response=greeting
                 )
@@ -145,7 +175,7 @@ class AppointmentTools:
 
                 return ToolResult(
                     success=True,
-                    data={"user": user.model_dump(), "is_returning": False},
+                    data={"user": user.model_dump(exclude_unset=True), "is_returning": False},
                     message=f"New user created: {normalized_phone}",
                     verbal_response="Great, I've got your number. How can I help you today?"
                 )
@@ -177,7 +207,7 @@ class AppointmentTools:
             return ToolResult(
                 success=False,
                 error="Conversation not initialized",
-                verbal_response="I'm sorry, there was a technical issue."
+                verbal_response=_TECHNICAL_ISSUE
             )
 
         try:
@@ -223,7 +253,7 @@ class AppointmentTools:
                 success=True,
                 data={"slots": [s.model_dump() for s in available]},
                 message=f"Found {len(available)} available slots",
-                verbal_response=f"I have some availability for you. {verbal}. Which time works best?"
+                verbal_response=_SLOTS_TMPL % verbal
             )
 
         except Exception as e:
@@ -234,18 +264,36 @@ class AppointmentTools:
                 verbal_response="I had trouble checking availability. Please try again."
             )
 
-    async def _get_booked_slots(self) -> List[tuple]:
-        """Get list of already booked slots."""
-        try:
-            # Query all scheduled appointments
-            response = self.db.client.table("appointments").select(
-                "date, time"
-            ).eq("status", "scheduled").execute()
+    async def _get_booked_slots(self) -> FrozenSet[int]:
+        """
+        Get keys (see slot_key) of already booked slots.
 
-            return [(apt["date"], apt["time"]) for apt in response.data]
-        except Exception as e:
-            logger.warning(f"Error getting booked slots: {e}")
-            return []
+        Results are reused for BOOKED_SLOTS_TTL seconds, since callers often
+        ask for availability several times in quick succession. Bookings made
+        through these tools update the cached set directly.
+        """
+        cache = self._booked_slots_cache
+        if cache and monotonic() - cache[0] < BOOKED_SLOTS_TTL:
+            return cache[1]
+
+        booked = await self.db.get_booked_slots()
+        if booked is None:
+            # Don't cache a failed fetch, so the next call retries the query
+            return frozenset()
+        self._booked_slots_cache = (monotonic(), booked)
+        return booked
+
+    def _cache_booked_slot(self, date: str, time: str) -> None:
+        """Record a newly booked slot in the booked slots cache."""
+        if self._booked_slots_cache:
+            fetched_at, booked = self._booked_slots_cache
+            self._booked_slots_cache = (fetched_at, booked | {slot_key(date, time)})
+
+    def _uncache_booked_slot(self, date: str, time: str) -> None:
+        """Remove a freed slot from the booked slots cache."""
+        if self._booked_slots_cache:
+            fetched_at, booked = self._booked_slots_cache
+            self._booked_slots_cache = (fetched_at, booked - {slot_key(date, time)})
 
     async def book_appointment(
         self,
@@ -272,7 +320,7 @@ class AppointmentTools:
             return ToolResult(
                 success=False,
                 error="Conversation not initialized",
-                verbal_response="I'm sorry, there was a technical issue."
+                verbal_response=_TECHNICAL_ISSUE
             )
 
         if not self.state.is_identified:
@@ -294,27 +342,16 @@ class AppointmentTools:
                     verbal_response=error_msg
                 )
 
-            # Check if slot is still available
-            is_available = await self.db.check_slot_available(date, time)
-            if not is_available:
-                return ToolResult(
-                    success=False,
-                    error="Slot already booked",
-                    verbal_response="I'm sorry, that slot was just taken. Would you like me to find another available time?"
-                )
-
-            # Update user name if provided
-            if user_name and not self.state.user_name:
-                self.state.user_name = user_name
-                await self.db.create_or_update_user(
-                    self.state.user_phone,
-                    name=user_name
-                )
+            # Save the user's name if provided and different from what's on file.
+            # State is only updated once the booking succeeds, so a retry after
+            # a taken slot still sends the name to the database.
+            new_name = None
+            if user_name and self.state.user_name != user_name:
+                new_name = user_name
 
-            # Create appointment
             appointment = Appointment(
                 user_phone=self.state.user_phone,
-                user_name=self.state.user_name or user_name,
+                user_name=new_name or self.state.user_name,
                 date=date,
                 time=time,
                 duration_minutes=duration_minutes,
@@ -322,32 +359,37 @@ class AppointmentTools:
                 status=AppointmentStatus.SCHEDULED,
             )
 
-            created = await self.db.create_appointment(appointment)
+            # Check availability, update the user and create the appointment
+            # in a single transaction
+            created = await self.db.book_appointment(appointment, user_name=new_name)
+            if not created:
+                return ToolResult(
+                    success=False,
+                    error="Slot already booked",
+                    verbal_response="I'm sorry, that slot was just taken. Would you like me to find another available time?"
+                )
+
+            if new_name:
+                self.state.user_name = new_name
+            self._cache_booked_slot(created.date, created.time)
 
             # Track in state
-            self.state.appointments_booked.append({
+            action = {
                 "id": created.id,
                 "date": date,
                 "time": time,
                 "purpose": purpose,
-            })
+            }
+            self.state.appointments_booked.append(action)
+            self.state.last_action = ("booked", action)
 
             # Format verbal confirmation
-            try:
-                date_obj = datetime.strptime(date, "%Y-%m-%d")
-                friendly_date = date_obj.strftime("%A, %B %d")
-                time_obj = datetime.strptime(time, "%H:%M")
-                friendly_time = time_obj.strftime("%I:%M %p").lstrip("0")
-            except ValueError:
-                friendly_date = date
-                friendly_time = time
-
             purpose_text = f" for {purpose}" if purpose else ""
-            verbal = f"I've booked your appointment for {friendly_date} at {friendly_time}{purpose_text}. Is there anything else I can help you with?"
+            verbal = _BOOK_CONFIRM_TMPL % (created.friendly_date, created.friendly_time, purpose_text)
 
             return ToolResult(
                 success=True,
-                data={"appointment": created.model_dump()},
+                data={"appointment": created.model_dump(exclude_unset=True)},
                 message=f"Appointment booked: {created.id}",
                 verbal_response=verbal
             )
@@ -386,7 +428,7 @@ class AppointmentTools:
             return ToolResult(
                 success=False,
                 error="Conversation not initialized",
-                verbal_response="I'm sorry, there was a technical issue."
+                verbal_response=_TECHNICAL_ISSUE
             )
 
         if not self.state.is_identified:
@@ -432,7 +474,14 @@ class AppointmentTools:
 
             return ToolResult(
                 success=True,
-                data={"appointments": [a.model_dump() for a in appointments]},
+                data={
+                    "appointments": [
+                        # status is already a plain value (use_enum_values)
+                        {"id": a.id, "date": a.date, "time": a.time, "status": a.status}
+                        for a in appointments
+                    ],
+                    "count": len(appointments),
+                },
                 message=f"Found {len(appointments)} appointments",
                 verbal_response=verbal
             )
@@ -481,13 +530,8 @@ class AppointmentTools:
                     )
             elif date and time:
                 # Find by date/time
-                appointments = await self.db.get_appointments_by_phone(
-                    self.state.user_phone,
-                    status=AppointmentStatus.SCHEDULED,
-                )
-                apt = next(
-                    (a for a in appointments if a.date == date and a.time == time),
-                    None
+                apt = await self.db.get_appointment_by_phone_date_time(
+                    self.state.user_phone, date, time
                 )
                 if not apt:
                     return ToolResult(
@@ -504,19 +548,22 @@ class AppointmentTools:
 
             # Cancel the appointment
             cancelled = await self.db.cancel_appointment(apt.id)
+            self._uncache_booked_slot(apt.date, apt.time)
 
             # Track in state
-            self.state.appointments_cancelled.append({
+            action = {
                 "id": apt.id,
                 "date": apt.date,
                 "time": apt.time,
-            })
+            }
+            self.state.appointments_cancelled.append(action)
+            self.state.last_action = ("cancelled", action)
 
-            verbal = f"I've cancelled your appointment on {apt.date} at {apt.time}. Is there anything else I can help you with?"
+            verbal = _CANCEL_CONFIRM_TMPL % (apt.date, apt.time)
 
             return ToolResult(
                 success=True,
-                data={"appointment": cancelled.model_dump()},
+                data={"appointment": cancelled.model_dump(exclude_unset=True)},
                 message=f"Appointment {apt.id} cancelled",
                 verbal_response=verbal
             )
@@ -575,13 +622,8 @@ class AppointmentTools:
                         verbal_response="I couldn't find that appointment."
                     )
             elif current_date and current_time:
-                appointments = await self.db.get_appointments_by_phone(
-                    self.state.user_phone,
-                    status=AppointmentStatus.SCHEDULED,
-                )
-                apt = next(
-                    (a for a in appointments if a.date == current_date and a.time == current_time),
-                    None
+                apt = await self.db.get_appointment_by_phone_date_time(
+                    self.state.user_phone, current_date, current_time
                 )
                 if not apt:
                     return ToolResult(
@@ -616,21 +658,27 @@ class AppointmentTools:
                 new_date=new_date,
                 new_time=new_time,
             )
+            # Key the cache from the stored row: the requested time may be
+            # unpadded ("9:30"), while the database returns HH:MM:SS
+            self._uncache_booked_slot(apt.date, apt.time)
+            self._cache_booked_slot(modified.date, modified.time)
 
             # Track in state
-            self.state.appointments_modified.append({
+            action = {
                 "id": apt.id,
                 "old_date": apt.date,
                 "old_time": apt.time,
                 "new_date": target_date,
                 "new_time": target_time,
-            })
+            }
+            self.state.appointments_modified.append(action)
+            self.state.last_action = ("modified", action)
 
-            verbal = f"I've updated your appointment to {target_date} at {target_time}. Is there anything else?"
+            verbal = _MODIFY_CONFIRM_TMPL % (target_date, target_time)
 
             return ToolResult(
                 success=True,
-                data={"appointment": modified.model_dump()},
+                data={"appointment": modified.model_dump(exclude_unset=True)},
                 message=f"Appointment {apt.id} modified",
                 verbal_response=verbal
             )
@@ -672,21 +720,16 @@ class AppointmentTools:
         # Build summary data
         summary_data = {
             "reason": reason,
-            "appointments_booked": self.state.appointments_booked,
-            "appointments_modified": self.state.appointments_modified,
-            "appointments_cancelled": self.state.appointments_cancelled,
+            "appointments_booked": list(self.state.appointments_booked),
+            "appointments_modified": list(self.state.appointments_modified),
+            "appointments_cancelled": list(self.state.appointments_cancelled),
             "user_identified": self.state.is_identified,
         }
 
-        # Generate farewell
-        if self.state.appointments_booked:
-            apt = self.state.appointments_booked[-1]
-            verbal = f"Great! Your appointment is confirmed for {apt['date']} at {apt['time']}. Have a wonderful day!"
-        elif self.state.appointments_modified:
-            apt = self.state.appointments_modified[-1]
-            verbal = f"Your appointment has been updated to {apt['new_date']} at {apt['new_time']}. Take care!"
-        elif self.state.appointments_cancelled:
-            verbal = "Your appointment has been cancelled. Feel free to reach out when you'd like to schedule again. Goodbye!"
+        # Generate farewell based on the most recent change
+        if self.state.last_action:
+            kind, details = self.state.last_action
+            verbal = _FAREWELL_TMPLS[kind] % details
         else:
             verbal = "Thank you for calling. Have a great day!"
 
@@ -708,24 +751,25 @@ class AppointmentTools:
         Returns:
             ToolResult from the tool execution
         """
-        tool_map = {
-            "identify_user": self.identify_user,
-            "fetch_slots": self.fetch_slots,
-            "book_appointment": self.book_appointment,
-            "retrieve_appointments": self.retrieve_appointments,
-            "cancel_appointment": self.cancel_appointment,
-            "modify_appointment": self.modify_appointment,
-            "end_conversation": self.end_conversation,
-        }
-
-        tool_func = tool_map.get(tool_name)
-        if not tool_func:
+        if tool_name not in self._TOOL_NAMES:
             return ToolResult(
                 success=False,
                 error=f"Unknown tool: {tool_name}",
                 verbal_response="I'm not sure how to do that."
             )
 
+        unexpected = tool_input.keys() - self._tool_params[tool_name]
+        if unexpected:
+            error = f"{tool_name}() got unexpected parameters: {', '.join(sorted(unexpected))}"
+            logger.error(f"Tool parameter error for {tool_name}: {error}")
+            return ToolResult(
+                success=False,
+                error=error,
+                verbal_response="I had trouble processing that request."
+            )
+
+        tool_func = getattr(self, tool_name)
+
         try:
             return await tool_func(**tool_input)
         except TypeError as e:
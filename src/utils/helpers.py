@@ -1,10 +1,52 @@
 """Helper utility functions."""
 
 import re
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
 from typing import Optional, Tuple
 from dateutil import parser as date_parser
-from dateutil.relativedelta import relativedelta
+
+_WEEKDAY_NUMBERS = {
+    name: number
+    for number, name in enumerate(
+        ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+    )
+}
+
+# Common date phrases (handled without dateutil) and times of day, matched
+# in a single scan. A phrase such as "in 3 days" is consumed whole, so its
+# count is never read as a time.
+_DATETIME_RE = re.compile(
+    r'\b(?:(?P<rel>tomorrow|today|tonight|next week|this week)'
+    r'|in\s+(?P<n>\d+)\s+(?P<unit>day|week)s?\b'
+    r'|(?P<wd>' + '|'.join(_WEEKDAY_NUMBERS) + r')\b)'
+    r'|(?P<hour>[0-9]{1,2})(?::(?P<minute>[0-9]{2}))?\s*(?P<period>am|pm)?'
+)
+_NO_OFFSET = timedelta()
+_ONE_DAY = timedelta(days=1)
+_ONE_WEEK = timedelta(weeks=1)
+_RELATIVE_OFFSETS = {
+    "tomorrow": _ONE_DAY,
+    "today": _NO_OFFSET,
+    "tonight": _NO_OFFSET,
+    "next week": _ONE_WEEK,
+    "this week": _NO_OFFSET,
+}
+
+# Explicit calendar dates ("jan 5", "21st", "12/25") that a weekday alone can't resolve
+_CALENDAR_DATE_RE = re.compile(
+    r'\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\b'
+    r'|\d{1,2}(?:st|nd|rd|th)\b'
+    r'|\d{1,4}[/-]\d{1,2}'
+)
+
+# ISO date or datetime, e.g. "2026-01-05" or "2026-01-05t14:30" (after lowercasing)
+_ISO_RE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}(?:[t ][0-9]{2}:[0-9]{2}(?::[0-9]{2})?)?')
+
+_DIGITS = "0123456789"
+
+# bytes.translate deletion table: every byte except ASCII 0-9
+_NON_DIGIT_BYTES = bytes(c for c in range(256) if not 48 <= c <= 57)
 
 
 def format_datetime(dt: datetime, format_type: str = "friendly") -> str:
@@ -20,10 +62,47 @@ def format_datetime(dt: datetime, format_type: str = "friendly") -> str:
     """
     if format_type == "iso":
         return dt.isoformat()
-    elif format_type == "short":
-        return dt.strftime("%m/%d %I:%M %p")
-    else:  # friendly
-        return dt.strftime("%A, %B %d at %I:%M %p").replace(" 0", " ")
+
+    hour12 = (dt.hour - 1) % 12 + 1
+    meridiem = "AM" if dt.hour < 12 else "PM"
+    if format_type == "short":
+        return f"{dt.month:02d}/{dt.day:02d} {hour12:02d}:{dt.minute:02d} {meridiem}"
+    else:  # friendly, day and hour without zero padding
+        return f"{dt:%A, %B} {dt.day} at {hour12}:{dt.minute:02d} {meridiem}"
+
+
+@lru_cache(maxsize=256)
+def format_date_for_speech(date_str: str) -> str:
+    """
+    Format a stored date for speech.
+
+    Args:
+        date_str: Date in YYYY-MM-DD format
+
+    Returns:
+        e.g. "Monday, January 05", or the input unchanged if it can't be parsed
+    """
+    try:
+        return date.fromisoformat(date_str).strftime("%A, %B %d")
+    except ValueError:
+        return date_str
+
+
+@lru_cache(maxsize=64)
+def format_time_for_speech(time_str: str) -> str:
+    """
+    Format a stored time for speech.
+
+    Args:
+        time_str: Time in HH:MM or HH:MM:SS format
+
+    Returns:
+        e.g. "8:30 AM", or the input unchanged if it can't be parsed
+    """
+    try:
+        return time.fromisoformat(time_str).strftime("%I:%M %p").lstrip("0")
+    except ValueError:
+        return time_str
 
 
 def parse_user_datetime(text: str, reference: Optional[datetime] = None) -> Tuple[Optional[str], Optional[str]]:
@@ -40,44 +119,87 @@ def parse_user_datetime(text: str, reference: Optional[datetime] = None) -> Tupl
     if reference is None:
         reference = datetime.now()
 
-    text = text.lower().strip()
+    # Only the reference date affects the result, so cache on it
+    return _parse_user_datetime(text.lower().strip(), reference.date())
+
+
+@lru_cache(maxsize=1024)
+def _parse_user_datetime(text: str, reference_date: date) -> Tuple[Optional[str], Optional[str]]:
+    """Parse normalized text against a reference date (see parse_user_datetime)."""
+    reference = datetime.combine(reference_date, time())
 
     try:
-        # Handle relative dates
-        if "tomorrow" in text:
-            date = reference + relativedelta(days=1)
-        elif "today" in text:
-            date = reference
-        elif "next week" in text:
-            date = reference + relativedelta(weeks=1)
+        # ISO input needs no fuzzy parsing
+        if _ISO_RE.fullmatch(text):
+            parsed = datetime.fromisoformat(text)
+            date_str = f"{parsed.year:04d}-{parsed.month:02d}-{parsed.day:02d}"
+            if len(text) == 10:
+                return date_str, None
+            return date_str, f"{parsed.hour:02d}:{parsed.minute:02d}"
+
+        # First date phrase and first time of day, from one pass over the text
+        phrase = time_match = None
+        if any(digit in text for digit in _DIGITS):
+            for match in _DATETIME_RE.finditer(text):
+                if match.group("hour") is None:
+                    phrase = phrase or match
+                else:
+                    time_match = time_match or match
+                if phrase and time_match:
+                    break
+        else:
+            # Without digits there is no time, so the first match is the phrase
+            phrase = _DATETIME_RE.search(text)
+
+        # Handle common phrases directly, falling back to dateutil
+        if phrase and phrase.group("rel"):
+            parsed = reference + _RELATIVE_OFFSETS[phrase.group("rel")]
+        elif phrase and phrase.group("n"):
+            unit = _ONE_DAY if phrase.group("unit") == "day" else _ONE_WEEK
+            parsed = reference + int(phrase.group("n")) * unit
+        elif phrase and phrase.group("wd") and not _CALENDAR_DATE_RE.search(text):
+            # Next occurrence of the weekday, including today
+            days_ahead = (_WEEKDAY_NUMBERS[phrase.group("wd")] - reference.weekday()) % 7
+            parsed = reference + days_ahead * _ONE_DAY
         else:
             # Try to parse with dateutil
-            date = date_parser.parse(text, fuzzy=True, default=reference)
+            parsed = date_parser.parse(text, fuzzy=True, default=reference)
 
-        date_str = date.strftime("%Y-%m-%d")
+        date_str = f"{parsed.year:04d}-{parsed.month:02d}-{parsed.day:02d}"
 
         # Extract time if present
         time_str = None
-        time_match = re.search(r'(\d{1,2})(?::(\d{2}))?\s*(am|pm)?', text, re.IGNORECASE)
         if time_match:
-            hour = int(time_match.group(1))
-            minute = int(time_match.group(2) or 0)
-            period = time_match.group(3)
-
+            # The groups hold one or two ASCII digits, so convert them directly
+            hour_digits = time_match.group("hour")
+            hour = ord(hour_digits[-1]) - 48
+            if len(hour_digits) == 2:
+                hour += (ord(hour_digits[0]) - 48) * 10
+            minute_digits = time_match.group("minute")
+            minute = (
+                (ord(minute_digits[0]) - 48) * 10 + ord(minute_digits[1]) - 48
+                if minute_digits else 0
+            )
+            period = time_match.group("period")
+
+            # 12am -> 0, 12pm -> 12, 1pm -> 13 (text is already lowercase)
             if period:
-                if period.lower() == 'pm' and hour < 12:
-                    hour += 12
-                elif period.lower() == 'am' and hour == 12:
-                    hour = 0
+                hour = hour % 12 + (12 if period == 'pm' else 0)
 
             time_str = f"{hour:02d}:{minute:02d}"
 
         return date_str, time_str
 
-    except (ValueError, TypeError):
+    except (ValueError, TypeError, OverflowError):
         return None, None
 
 
+def _strip_non_digits(phone: str) -> str:
+    """Remove everything except ASCII digits from a phone number."""
+    return phone.encode('ascii', 'ignore').translate(None, _NON_DIGIT_BYTES).decode('ascii')
+
+
+@lru_cache(maxsize=256)
 def sanitize_phone(phone: str) -> str:
     """
     Sanitize and format phone number.
@@ -89,7 +211,7 @@ def sanitize_phone(phone: str) -> str:
         Normalized phone number
     """
     # Remove all non-digit characters
-    digits = re.sub(r'\D', '', phone)
+    digits = _strip_non_digits(phone)
 
     # Handle US numbers
     if len(digits) == 10:
@@ -112,24 +234,31 @@ def format_phone_for_display(phone: str) -> str:
     Returns:
         Human-readable format
     """
-    digits = re.sub(r'\D', '', phone)
+    # sanitize_phone output is already "+<digits>"
+    if phone.startswith('+') and phone.isascii() and phone[1:].isdigit():
+        digits = phone[1:]
+    else:
+        digits = _strip_non_digits(phone)
 
     if len(digits) == 11 and digits.startswith('1'):
-        return f"+1 ({digits[1:4]}) {digits[4:7]}-{digits[7:]}"
+        return ''.join(('+1 (', digits[1:4], ') ', digits[4:7], '-', digits[7:]))
     elif len(digits) == 10:
-        return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+        return ''.join(('(', digits[:3], ') ', digits[3:6], '-', digits[6:]))
 
     return phone
 
 
 def calculate_duration_seconds(start: datetime, end: datetime) -> int:
     """Calculate duration in seconds between two datetimes."""
-    delta = end - start
-    return int(delta.total_seconds())
+    return int((end - start).total_seconds())
+
+
+_DEFAULT_SUFFIX = "..."
 
 
-def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
+def truncate_text(text: str, max_length: int = 100, suffix: str = _DEFAULT_SUFFIX) -> str:
     """Truncate text to max length with suffix."""
     if len(text) <= max_length:
         return text
-    return text[:max_length - len(suffix)] + suffix
+    cut = max_length - (3 if suffix is _DEFAULT_SUFFIX else len(suffix))
+    return f"{text[:cut]}{suffix}"